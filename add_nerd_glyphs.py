@@ -10,40 +10,63 @@ import os
 import copy
 from fontTools.ttLib import TTFont
 from fontTools.ttLib.tables._g_l_y_f import GlyphCoordinates
+from fontTools.misc.roundTools import otRound
+from font_cache import load_source_font, release_source_font
+from outline_cleanup import cleanup_glyph, add_cleanup_stats, print_cleanup_report
 
 # Nerd Font source (pre-patched)
 NERD_FONT_REGULAR = "HackNerdFont/HackNerdFontMono-Regular.ttf"
 NERD_FONT_BOLD = "HackNerdFont/HackNerdFontMono-Bold.ttf"
 
-# Nerd Font Unicode ranges to copy
-NERD_FONT_RANGES = [
-    # Powerline
-    (0xE0A0, 0xE0A3),
-    (0xE0B0, 0xE0D7),
-    # Seti-UI + Custom
-    (0xE5FA, 0xE6B7),
-    # Devicons
-    (0xE700, 0xE8E3),
-    # Font Awesome
-    (0xE200, 0xE2A9),  # FA Extension
-    (0xED00, 0xF2FF),  # FA Main - includes Linux Tux U+F17C
-    # Weather
-    (0xE300, 0xE3E3),
-    # Octicons
-    (0xF400, 0xF533),
-    (0x2665, 0x2665),  # Heart
-    (0x26A1, 0x26A1),  # Lightning
-    # IEC Power Symbols
-    (0x23FB, 0x23FE),
-    (0x2B58, 0x2B58),
-    # Font Logos
-    (0xF300, 0xF381),
-    # Pomicons
-    (0xE000, 0xE00A),
-    # Codicons
-    (0xEA60, 0xEC1E),
-    # Material Design Icons (requires Format 12 cmap)
-    (0xF0001, 0xF1AF0),
+# Nerd Font glyph sets and their Unicode ranges to copy
+NERD_FONT_SETS = {
+    "Powerline": [
+        (0xE0A0, 0xE0A3),
+        (0xE0B0, 0xE0D7),
+    ],
+    "Seti-UI + Custom": [
+        (0xE5FA, 0xE6B7),
+    ],
+    "Devicons": [
+        (0xE700, 0xE8E3),
+    ],
+    "Font Awesome": [
+        (0xE200, 0xE2A9),  # FA Extension
+        (0xED00, 0xF2FF),  # FA Main - includes Linux Tux U+F17C
+    ],
+    "Weather": [
+        (0xE300, 0xE3E3),
+    ],
+    "Octicons": [
+        (0xF400, 0xF533),
+        (0x2665, 0x2665),  # Heart
+        (0x26A1, 0x26A1),  # Lightning
+    ],
+    "IEC Power Symbols": [
+        (0x23FB, 0x23FE),
+        (0x2B58, 0x2B58),
+    ],
+    "Font Logos": [
+        (0xF300, 0xF381),
+    ],
+    "Pomicons": [
+        (0xE000, 0xE00A),
+    ],
+    "Codicons": [
+        (0xEA60, 0xEC1E),
+    ],
+    "Material Design Icons": [
+        (0xF0001, 0xF1AF0),  # requires Format 12 cmap
+    ],
+}
+NERD_FONT_RANGES = [r for ranges in NERD_FONT_SETS.values() for r in ranges]
+
+# Variants to patch: (base font, Nerd Font source, output path)
+VARIANTS = [
+    ("build/HackLine-Regular.ttf", NERD_FONT_REGULAR, "build/HackLineNF-Regular.ttf"),
+    ("build/HackLine-Bold.ttf", NERD_FONT_BOLD, "build/HackLineNF-Bold.ttf"),
+    ("build/HackLineJK-Regular.ttf", NERD_FONT_REGULAR, "build/HackLineJKNF-Regular.ttf"),
+    ("build/HackLineJK-Bold.ttf", NERD_FONT_BOLD, "build/HackLineJKNF-Bold.ttf"),
 ]
 
 
@@ -55,13 +78,23 @@ def is_nerd_glyph(cp):
     return False
 
 
+def nerd_set_name(cp):
+    """Name of the Nerd Font set containing codepoint."""
+    for name, ranges in NERD_FONT_SETS.items():
+        for start, end in ranges:
+            if start <= cp <= end:
+                return name
+    return "Other"
+
+
 def patch_with_nerd_glyphs(base_font_path, nerd_font_path, output_path):
     """Add Nerd Font glyphs from HackNerdFont to HackLine."""
     print(f"Loading {base_font_path}...")
     font = TTFont(base_font_path)
     
     print(f"Loading {nerd_font_path}...")
-    nerd_font = TTFont(nerd_font_path)
+    # Shared through the cache, only read here
+    nerd_font = load_source_font(nerd_font_path)
     
     base_upm = font['head'].unitsPerEm
     nerd_upm = nerd_font['head'].unitsPerEm
@@ -76,6 +109,7 @@ def patch_with_nerd_glyphs(base_font_path, nerd_font_path, output_path):
     glyph_order = list(font.getGlyphOrder())
     
     added = 0
+    cleanup_totals = {}
     for codepoint, nerd_glyph_name in nerd_cmap.items():
         if not is_nerd_glyph(codepoint):
             continue
@@ -95,15 +129,20 @@ def patch_with_nerd_glyphs(base_font_path, nerd_font_path, output_path):
             
             # Scale glyph
             if new_glyph.numberOfContours > 0 and hasattr(new_glyph, 'coordinates') and new_glyph.coordinates:
-                scaled_coords = [(int(x * scale), int(y * scale)) for x, y in new_glyph.coordinates]
+                scaled_coords = [(otRound(x * scale), otRound(y * scale)) for x, y in new_glyph.coordinates]
                 new_glyph.coordinates = GlyphCoordinates(scaled_coords)
                 new_glyph.recalcBounds(glyf_table)
             elif new_glyph.numberOfContours == -1 and hasattr(new_glyph, 'components'):
                 for comp in new_glyph.components:
                     if hasattr(comp, 'x'):
-                        comp.x = int(comp.x * scale)
+                        comp.x = otRound(comp.x * scale)
                     if hasattr(comp, 'y'):
-                        comp.y = int(comp.y * scale)
+                        comp.y = otRound(comp.y * scale)
+            
+            # Remove points made redundant by scaling
+            x_min = getattr(new_glyph, 'xMin', 0)
+            stats = cleanup_glyph(new_glyph, glyf_table)
+            add_cleanup_stats(cleanup_totals, nerd_set_name(codepoint), stats)
             
             glyf_table[new_glyph_name] = new_glyph
             glyph_order.append(new_glyph_name)
@@ -112,7 +151,9 @@ def patch_with_nerd_glyphs(base_font_path, nerd_font_path, output_path):
             # Add hmtx
             if nerd_glyph_name in nerd_font['hmtx'].metrics:
                 width, lsb = nerd_font['hmtx'].metrics[nerd_glyph_name]
-                font['hmtx'].metrics[new_glyph_name] = (int(width * scale), int(lsb * scale))
+                # Keep the LSB in sync if cleanup removed the leftmost contour
+                lsb_shift = getattr(new_glyph, 'xMin', x_min) - x_min
+                font['hmtx'].metrics[new_glyph_name] = (otRound(width * scale), otRound(lsb * scale) + lsb_shift)
             
             added += 1
             
@@ -121,6 +162,8 @@ def patch_with_nerd_glyphs(base_font_path, nerd_font_path, output_path):
             continue
     
     print(f"Added {added} Nerd Font glyphs")
+    print_cleanup_report("Nerd Font", cleanup_totals)
+    release_source_font(nerd_font_path)
     
     # Update font
     font.setGlyphOrder(glyph_order)
@@ -203,7 +246,6 @@ def patch_with_nerd_glyphs(base_font_path, nerd_font_path, output_path):
     # First save
     font.save(tmp_path)
     font.close()
-    nerd_font.close()
     
     # Reload and resave to normalize
     normalized_font = TTFont(tmp_path)
@@ -240,15 +282,7 @@ def main():
         print("https://github.com/ryanoasis/nerd-fonts/releases/download/v3.3.0/Hack.zip")
         sys.exit(1)
     
-    # Input/Output paths
-    inputs = [
-        ("build/HackLine-Regular.ttf", NERD_FONT_REGULAR, "build/HackLineNF-Regular.ttf"),
-        ("build/HackLine-Bold.ttf", NERD_FONT_BOLD, "build/HackLineNF-Bold.ttf"),
-        ("build/HackLineJK-Regular.ttf", NERD_FONT_REGULAR, "build/HackLineJKNF-Regular.ttf"),
-        ("build/HackLineJK-Bold.ttf", NERD_FONT_BOLD, "build/HackLineJKNF-Bold.ttf"),
-    ]
-    
-    for base_path, nerd_path, output_path in inputs:
+    for base_path, nerd_path, output_path in VARIANTS:
         if not os.path.exists(base_path):
             print(f"Error: {base_path} not found")
             continue
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+HackLine Runtime Benchmark
+Measures how the built fonts perform for end users (via Pillow/FreeType):
+font open time, cmap lookup latency, per-glyph rasterization time and RSS after load.
+Results are written as JSON so they can be compared between builds.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import platform
+import statistics
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import PIL
+from PIL import ImageFont, features
+from fontTools.ttLib import TTFont
+from add_nerd_glyphs import NERD_FONT_RANGES
+
+# --- Default Configuration ---
+DEFAULT_FONT_GLOB = "build/*.ttf"
+DEFAULT_OUTPUT_PATH = "build/benchmark.json"
+DEFAULT_REPEAT = 5
+OPEN_SIZE = 16  # ppem used for the open benchmarks
+RASTER_SIZES = [12, 16, 24, 32]  # common terminal ppem sizes
+SAMPLES_PER_CATEGORY = 200
+
+
+def _sample_range(ranges, count=SAMPLES_PER_CATEGORY):
+    """Pick up to count codepoints spread evenly over the given ranges."""
+    codepoints = [cp for start, end in ranges for cp in range(start, end + 1)]
+    step = max(1, len(codepoints) // count)
+    return codepoints[::step][:count]
+
+
+# Codepoints looked up and rendered per category
+CATEGORIES = {
+    "ascii": list(range(0x21, 0x7F)),
+    "kana": _sample_range([(0x3041, 0x3096), (0x30A1, 0x30FA)]),
+    "kanji": _sample_range([(0x4E00, 0x9FFF)]),
+    "hangul": _sample_range([(0xAC00, 0xD7A3)]),
+    "pua_icons": _sample_range(
+        [(start, end) for start, end in NERD_FONT_RANGES if 0xE000 <= start <= 0xF8FF or start >= 0xF0000]
+    ),
+}
+
+
+def current_rss_kb():
+    """Resident set size of this process in KB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def summarize(samples_ns):
+    """Median and 95th percentile of timing samples, in microseconds."""
+    if not samples_ns:
+        return {"median_us": None, "p95_us": None}
+    samples = sorted(samples_ns)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return {
+        "median_us": round(statistics.median(samples) / 1000, 3),
+        "p95_us": round(p95 / 1000, 3),
+    }
+
+
+def measure_cold_open(font_path, chars):
+    """Run in a fresh process: first open time and RSS before/after load and first render.
+    The OS page cache is not dropped, so "cold" means a fresh FreeType instance
+    and process, not a cold disk.
+    """
+    rss_before = current_rss_kb()
+    start = time.perf_counter_ns()
+    font = ImageFont.truetype(font_path, OPEN_SIZE, layout_engine=ImageFont.Layout.BASIC)
+    cold_ns = time.perf_counter_ns() - start
+    rss_after_load = current_rss_kb()
+
+    for ch in chars:
+        font.getmask(ch)
+    rss_after_render = current_rss_kb()
+
+    return {
+        "cold_open_ms": round(cold_ns / 1e6, 3),
+        "rss_kb": {
+            "before_load": rss_before,
+            "after_load": rss_after_load,
+            "after_render": rss_after_render,
+            "load_delta": rss_after_load - rss_before,
+            "render_delta": rss_after_render - rss_after_load,
+        },
+    }
+
+
+def measure_warm_open(font_path, repeat):
+    """Open time once the font file and FreeType are warm."""
+    ImageFont.truetype(font_path, OPEN_SIZE, layout_engine=ImageFont.Layout.BASIC)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        ImageFont.truetype(font_path, OPEN_SIZE, layout_engine=ImageFont.Layout.BASIC)
+        samples.append(time.perf_counter_ns() - start)
+    return round(statistics.median(samples) / 1e6, 3)
+
+
+def measure_lookup(font, chars, repeat):
+    """Per-character cmap lookup + glyph metrics latency (getlength does not rasterize)."""
+    samples = []
+    for _ in range(repeat):
+        for ch in chars:
+            start = time.perf_counter_ns()
+            font.getlength(ch)
+            samples.append(time.perf_counter_ns() - start)
+    return summarize(samples)
+
+
+def measure_raster(font, chars, repeat):
+    """Per-glyph rasterization time."""
+    samples = []
+    for _ in range(repeat):
+        for ch in chars:
+            start = time.perf_counter_ns()
+            font.getmask(ch)
+            samples.append(time.perf_counter_ns() - start)
+    return summarize(samples)
+
+
+def benchmark_font(font_path, repeat):
+    """Benchmark one font. Returns a JSON-serializable dict."""
+    tt = TTFont(font_path, lazy=True)
+    cmap = tt.getBestCmap()
+    num_glyphs = tt['maxp'].numGlyphs
+    tt.close()
+
+    # Only time characters the font actually maps; the rest would hit .notdef
+    present = {}
+    missing = {}
+    for name, codepoints in CATEGORIES.items():
+        present[name] = [chr(cp) for cp in codepoints if cp in cmap]
+        missing[name] = len(codepoints) - len(present[name])
+    all_chars = [ch for chars in present.values() for ch in chars]
+
+    # Cold open and RSS in a fresh process, so nothing is cached in this one
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        cold = executor.submit(measure_cold_open, font_path, all_chars).result()
+
+    result = {
+        "file_size": os.path.getsize(font_path),
+        "num_glyphs": num_glyphs,
+        "cmap_entries": len(cmap),
+        "open": {
+            "cold_ms": cold["cold_open_ms"],
+            "warm_ms": measure_warm_open(font_path, repeat),
+        },
+        "rss_kb": cold["rss_kb"],
+        "lookup": {},
+        "raster": {},
+    }
+
+    font = ImageFont.truetype(font_path, OPEN_SIZE, layout_engine=ImageFont.Layout.BASIC)
+    for name, chars in present.items():
+        result["lookup"][name] = {"count": len(chars), "missing": missing[name], **measure_lookup(font, chars, repeat)}
+
+    for size in RASTER_SIZES:
+        font = ImageFont.truetype(font_path, size, layout_engine=ImageFont.Layout.BASIC)
+        result["raster"][str(size)] = {name: measure_raster(font, chars, repeat) for name, chars in present.items() if chars}
+
+    return result
+
+
+def main():
+    """Benchmarks every built font and writes the results as JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark font load time, glyph lookup and rasterization.")
+    parser.add_argument("fonts", nargs="*", help=f"Font files to benchmark (default: {DEFAULT_FONT_GLOB}).")
+    parser.add_argument("--output-path", default=DEFAULT_OUTPUT_PATH, help="Path to save the JSON results ('-' for stdout).")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Number of timing passes per measurement.")
+    args = parser.parse_args()
+
+    font_paths = args.fonts or sorted(glob.glob(DEFAULT_FONT_GLOB))
+    if not font_paths:
+        print(f"Error: No fonts found matching '{DEFAULT_FONT_GLOB}'")
+        print("Please build the fonts first.")
+        sys.exit(1)
+
+    # Progress goes to stderr when the JSON is written to stdout
+    log = sys.stderr if args.output_path == "-" else sys.stdout
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pillow": PIL.__version__,
+            "freetype": features.version("freetype2"),
+        },
+        "config": {
+            "repeat": args.repeat,
+            "open_size": OPEN_SIZE,
+            "raster_sizes": RASTER_SIZES,
+        },
+        "fonts": {},
+    }
+
+    for font_path in font_paths:
+        print(f"Benchmarking {font_path}...", file=log)
+        results["fonts"][os.path.basename(font_path)] = benchmark_font(font_path, args.repeat)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output_path == "-":
+        print(output)
+    else:
+        output_dir = os.path.dirname(args.output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(args.output_path, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"✓ Benchmark results saved to '{args.output_path}'")
+
+
+if __name__ == "__main__":
+    main()
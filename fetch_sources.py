@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+HackLine Source Fetcher
+Downloads the source font archives concurrently, verifies their pinned SHA-256 sums,
+keeps them in a content-addressed cache shared by all checkouts and extracts only
+the TTF files the build needs.
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import zipfile
+import zlib
+import argparse
+import tempfile
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import merge_fonts
+import add_nerd_glyphs
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hackline", "sources")
+LOCK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sources.lock.json")
+CHUNK_SIZE = 1024 * 1024
+URL_SCHEMES = ("http://", "https://", "file://")
+
+# Source archives: (name, url, extract directory, files needed by the build)
+# Archive members are the file paths relative to the extract directory.
+SOURCES = [
+    ("Hack", "https://github.com/source-foundry/Hack/releases/download/v3.003/Hack-v3.003-ttf.zip",
+     "hack_font", [merge_fonts.HACK_REGULAR, merge_fonts.HACK_BOLD]),
+    ("LINE Seed JP", "https://seed.line.me/src/images/fonts/LINE_Seed_JP.zip",
+     "line_seed_font", [merge_fonts.LINE_SEED_JP_REGULAR, merge_fonts.LINE_SEED_JP_BOLD]),
+    ("LINE Seed KR", "https://seed.line.me/src/images/fonts/LINE_Seed_Sans_KR.zip",
+     "line_seed_font_kr", [merge_fonts.LINE_SEED_KR_REGULAR, merge_fonts.LINE_SEED_KR_BOLD]),
+]
+NERD_SOURCES = [
+    ("HackNerdFont", "https://github.com/ryanoasis/nerd-fonts/releases/download/v3.3.0/Hack.zip",
+     "HackNerdFont", [add_nerd_glyphs.NERD_FONT_REGULAR, add_nerd_glyphs.NERD_FONT_BOLD]),
+]
+
+
+class FetchError(Exception):
+    """Raised when a source cannot be fetched or fails verification."""
+
+
+def sha256_file(path):
+    """SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_path(cache_dir, sha256):
+    """Cache location of an archive with the given content hash."""
+    return os.path.join(cache_dir, "sha256", sha256[:2], sha256)
+
+
+def url_index_path(cache_dir, url):
+    """Cache file that remembers the content hash last downloaded from a URL."""
+    return os.path.join(cache_dir, "urls", hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+
+def mirror_location(mirror, url):
+    """Where to find an archive in a mirror directory or mirror base URL."""
+    archive_name = url.rsplit("/", 1)[-1]
+    if mirror.startswith(URL_SCHEMES):
+        return mirror.rstrip("/") + "/" + archive_name
+    return os.path.join(mirror, archive_name)
+
+
+def download(location, cache_dir, name):
+    """Download (or copy) an archive into the cache. Returns its SHA-256."""
+    tmp_dir = os.path.join(cache_dir, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    digest = hashlib.sha256()
+    try:
+        print(f"[{name}] Downloading {location}...")
+        # Anything that is not a URL is a local mirror path, so a missing file is reported as such
+        if location.startswith(URL_SCHEMES):
+            source = urllib.request.urlopen(location)
+        else:
+            source = open(location, "rb")
+        with source, os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                out.write(chunk)
+
+        sha256 = digest.hexdigest()
+        target = blob_path(cache_dir, sha256)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Atomic, so concurrent builds in other worktrees never see a partial file
+        os.replace(tmp_path, target)
+        return sha256
+    except (OSError, ValueError) as e:
+        raise FetchError(f"[{name}] Could not download {location}: {e}") from e
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def fetch_archive(source, pinned, cache_dir, mirror, allow_unpinned=False):
+    """Make sure a source archive is in the cache and verified. Returns (blob path, SHA-256).
+    Sources without a pinned SHA-256 are refused unless allow_unpinned is set.
+    """
+    name, url, _, _ = source
+    if pinned is None and not allow_unpinned:
+        raise FetchError(f"[{name}] No SHA-256 pinned in {os.path.basename(LOCK_PATH)} "
+                         "(run with --update-pins to pin it, or --allow-unpinned to skip the check)")
+    index_path = url_index_path(cache_dir, url)
+
+    # Pinned archives are looked up by content, unpinned ones by the hash last seen for their URL
+    known = pinned
+    if known is None and os.path.exists(index_path):
+        with open(index_path, encoding="utf-8") as f:
+            known = f.read().strip()
+
+    if known and os.path.exists(blob_path(cache_dir, known)):
+        if sha256_file(blob_path(cache_dir, known)) == known:
+            print(f"[{name}] Using cached archive")
+            return blob_path(cache_dir, known), known
+        print(f"[{name}] Warning: Cached archive is corrupt, downloading again")
+        os.unlink(blob_path(cache_dir, known))
+
+    sha256 = download(mirror_location(mirror, url) if mirror else url, cache_dir, name)
+    if pinned and sha256 != pinned:
+        os.unlink(blob_path(cache_dir, sha256))
+        raise FetchError(f"[{name}] SHA-256 mismatch: expected {pinned}, got {sha256}")
+
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(sha256)
+    return blob_path(cache_dir, sha256), sha256
+
+
+def _crc32_file(path):
+    """CRC-32 of a file, as stored in zip archives."""
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def extract_files(source, archive_path):
+    """Extract only the files the build needs, skipping those already up to date."""
+    name, _, extract_dir, files = source
+    with zipfile.ZipFile(archive_path) as archive:
+        members = {info.filename: info for info in archive.infolist()}
+        for dest in files:
+            member = os.path.relpath(dest, extract_dir).replace(os.sep, "/")
+            info = members.get(member)
+            if info is None:
+                # Fall back to the file name, in case the archive layout changed
+                matches = [i for i in members.values() if i.filename.rsplit("/", 1)[-1] == os.path.basename(dest)]
+                if len(matches) != 1:
+                    raise FetchError(f"[{name}] {member} not found in archive")
+                info = matches[0]
+
+            if os.path.exists(dest) and os.path.getsize(dest) == info.file_size and _crc32_file(dest) == info.CRC:
+                continue
+
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            with archive.open(info) as src, open(dest + ".tmp", "wb") as out:
+                shutil.copyfileobj(src, out, CHUNK_SIZE)
+            os.replace(dest + ".tmp", dest)
+            print(f"[{name}] Extracted {dest}")
+
+
+def fetch_source(source, pinned, cache_dir, mirror, allow_unpinned=False):
+    """Fetch, verify and extract one source. Returns its SHA-256."""
+    archive_path, sha256 = fetch_archive(source, pinned, cache_dir, mirror, allow_unpinned)
+    extract_files(source, archive_path)
+    print(f"[{source[0]}] ✓ OK")
+    return sha256
+
+
+def load_pins():
+    """Pinned SHA-256 sums by source name."""
+    if not os.path.exists(LOCK_PATH):
+        return {}
+    with open(LOCK_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch and verify the source fonts.")
+    parser.add_argument("-n", "--nerd", action="store_true", help="Also fetch HackNerdFont.")
+    parser.add_argument("--cache-dir", default=os.environ.get("HACKLINE_CACHE_DIR", DEFAULT_CACHE_DIR),
+                        help="Content-addressed archive cache, shared between checkouts.")
+    parser.add_argument("--mirror", default=os.environ.get("HACKLINE_MIRROR"),
+                        help="Local directory or base URL holding the archives, used instead of the upstream URLs.")
+    parser.add_argument("--update-pins", action="store_true",
+                        help=f"Record the SHA-256 of the fetched archives in {os.path.basename(LOCK_PATH)}.")
+    parser.add_argument("--allow-unpinned", action="store_true",
+                        help="Fetch sources that have no pinned SHA-256 instead of failing (not verified).")
+    args = parser.parse_args()
+
+    sources = SOURCES + (NERD_SOURCES if args.nerd else [])
+    # When updating, the pins are not checked: whatever is fetched gets pinned
+    pins = {} if args.update_pins else load_pins()
+    allow_unpinned = args.update_pins or args.allow_unpinned
+
+    failed = False
+    hashes = {}
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        futures = {}
+        for source in sources:
+            name = source[0]
+            futures[name] = executor.submit(
+                fetch_source, source, pins.get(name), args.cache_dir, args.mirror, allow_unpinned
+            )
+        for name, future in futures.items():
+            try:
+                hashes[name] = future.result()
+                if not args.update_pins and not pins.get(name):
+                    print(f"Warning: {name} is not pinned and was not verified, its SHA-256 is {hashes[name]}")
+            except (FetchError, zipfile.BadZipFile) as e:
+                print(f"Error: {e}")
+                failed = True
+
+    if failed:
+        sys.exit(1)
+
+    if args.update_pins:
+        pins = load_pins()
+        pins.update(hashes)
+        with open(LOCK_PATH, "w", encoding="utf-8") as f:
+            json.dump(pins, f, indent=2)
+            f.write("\n")
+        print(f"✓ Pinned {len(hashes)} sources in {LOCK_PATH}")
+
+
+if __name__ == "__main__":
+    main()
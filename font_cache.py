@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+HackLine Source Font Cache
+Keeps parsed, read-only source fonts (LINE Seed, HackNerdFont, ...) in memory
+so that forked worker processes and watch mode rebuilds can share one parse.
+Builds release each font when they are done with it; watch mode keeps them
+loaded between rebuilds.
+"""
+
+import io
+import os
+from fontTools.ttLib import TTFont
+
+# Parsed source fonts, keyed by path: (mtime, TTFont)
+_source_fonts = {}
+# Set by watch mode: release_source_font keeps fonts loaded
+_keep_loaded = False
+
+
+def keep_source_fonts(keep=True):
+    """Keep released source fonts in memory (watch mode) instead of dropping them."""
+    global _keep_loaded
+    _keep_loaded = keep
+
+
+def load_source_font(path):
+    """Load a source font, reusing the parsed font while the file is unchanged.
+    The returned font is shared, so callers must not modify or close it.
+    The file is read into memory first: forked workers then get their own copy
+    instead of sharing (and seeking) the parent's file descriptor.
+    Only workers started with fork inherit the cache (merge_fonts requests it
+    on Linux); spawn/forkserver workers start empty and parse again.
+    """
+    mtime = os.path.getmtime(path)
+    cached = _source_fonts.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "rb") as f:
+        font = TTFont(io.BytesIO(f.read()))
+    _source_fonts[path] = (mtime, font)
+    return font
+
+
+def release_source_font(path):
+    """Drop a source font from the cache once a build is done with it.
+    Does nothing while keep_source_fonts is on.
+    """
+    if _keep_loaded:
+        return
+    cached = _source_fonts.pop(path, None)
+    if cached is not None:
+        cached[1].close()
@@ -8,11 +8,17 @@ Uses proper GlyphCoordinates for scaled glyphs.
 import sys
 import os
 import copy
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from fontTools.ttLib import TTFont
 from fontTools.ttLib.tables import ttProgram
 from fontTools.ttLib.tables._g_l_y_f import Glyph, GlyphCoordinates
 from fontTools.pens.ttGlyphPen import TTGlyphPen
 from fontTools.pens.cu2quPen import Cu2QuPen
+from fontTools.misc.roundTools import otRound
+from font_cache import load_source_font, release_source_font
+from outline_cleanup import cleanup_glyph, add_cleanup_stats, print_cleanup_report
 
 # Paths
 HACK_REGULAR = "hack_font/ttf/Hack-Regular.ttf"
@@ -27,26 +33,32 @@ OUTPUT_BOLD = "build/HackLine-Bold.ttf"
 OUTPUT_JK_REGULAR = "build/HackLineJK-Regular.ttf"
 OUTPUT_JK_BOLD = "build/HackLineJK-Bold.ttf"
 
-# Japanese Unicode ranges (Hiragana, Katakana, CJK, etc.)
-JAPANESE_RANGES = [
-    (0x3000, 0x303F),  # CJK Symbols and Punctuation
-    (0x3040, 0x309F),  # Hiragana
-    (0x30A0, 0x30FF),  # Katakana
-    (0x31F0, 0x31FF),  # Katakana Phonetic Extensions
-    (0x4E00, 0x9FFF),  # CJK Unified Ideographs
-    (0xFF00, 0xFFEF),  # Halfwidth and Fullwidth Forms
-    (0x2E80, 0x2EFF),  # CJK Radicals Supplement
-    (0x3400, 0x4DBF),  # CJK Unified Ideographs Extension A
-]
-
-# Korean Unicode ranges (Hangul)
-KOREAN_RANGES = [
-    (0xAC00, 0xD7A3),  # Hangul Syllables
-    (0x1100, 0x11FF),  # Hangul Jamo
-    (0x3130, 0x318F),  # Hangul Compatibility Jamo
-    (0xA960, 0xA97F),  # Hangul Jamo Extended-A
-    (0xD7B0, 0xD7FF),  # Hangul Jamo Extended-B
-]
+# Japanese Unicode blocks (Hiragana, Katakana, CJK, etc.)
+JAPANESE_BLOCKS = {
+    "CJK Symbols and Punctuation": (0x3000, 0x303F),
+    "Hiragana": (0x3040, 0x309F),
+    "Katakana": (0x30A0, 0x30FF),
+    "Katakana Phonetic Extensions": (0x31F0, 0x31FF),
+    "CJK Unified Ideographs": (0x4E00, 0x9FFF),
+    "Halfwidth and Fullwidth Forms": (0xFF00, 0xFFEF),
+    "CJK Radicals Supplement": (0x2E80, 0x2EFF),
+    "CJK Unified Ideographs Extension A": (0x3400, 0x4DBF),
+}
+JAPANESE_RANGES = list(JAPANESE_BLOCKS.values())
+
+# Korean Unicode blocks (Hangul)
+KOREAN_BLOCKS = {
+    "Hangul Syllables": (0xAC00, 0xD7A3),
+    "Hangul Jamo": (0x1100, 0x11FF),
+    "Hangul Compatibility Jamo": (0x3130, 0x318F),
+    "Hangul Jamo Extended-A": (0xA960, 0xA97F),
+    "Hangul Jamo Extended-B": (0xD7B0, 0xD7FF),
+}
+KOREAN_RANGES = list(KOREAN_BLOCKS.values())
+
+# Parallel glyph transformation
+DEFAULT_JOBS = os.cpu_count() or 1
+SHARDS_PER_JOB = 4  # More shards than workers keeps the pool busy until the end
 
 
 def is_in_range(cp, ranges):
@@ -57,6 +69,15 @@ def is_in_range(cp, ranges):
     return False
 
 
+def cjk_block_name(cp):
+    """Name of the Japanese or Korean block containing codepoint."""
+    for blocks in (JAPANESE_BLOCKS, KOREAN_BLOCKS):
+        for name, (start, end) in blocks.items():
+            if start <= cp <= end:
+                return name
+    return "Other"
+
+
 def is_japanese_codepoint(cp):
     """Check if codepoint is in Japanese ranges."""
     return is_in_range(cp, JAPANESE_RANGES)
@@ -67,6 +88,36 @@ def is_korean_codepoint(cp):
     return is_in_range(cp, KOREAN_RANGES)
 
 
+def korean_extra_scale(cjk_font):
+    """Extra scale that brings Korean glyphs to the Japanese full width.
+    The original Korean glyph width (883) is smaller than Japanese (1000),
+    so scale up to keep the 5:3 full-width to half-width ratio.
+    """
+    # Get typical Korean glyph width (가 = U+AC00)
+    kr_cmap = cjk_font.getBestCmap()
+    if 0xAC00 not in kr_cmap:
+        return None
+    kr_width, _ = cjk_font['hmtx'].metrics[kr_cmap[0xAC00]]
+    # Scale to make full-width = 2048 (same as JP)
+    # Target width should be 2048, so extra_scale = 1000 / kr_width
+    return 1000 / kr_width
+
+
+# CJK sources: (language, font path, codepoint filter, extra scale function or None)
+CJK_SOURCES_JP_REGULAR = [("JP", LINE_SEED_JP_REGULAR, is_japanese_codepoint, None)]
+CJK_SOURCES_JP_BOLD = [("JP", LINE_SEED_JP_BOLD, is_japanese_codepoint, None)]
+CJK_SOURCES_KR_REGULAR = [("KR", LINE_SEED_KR_REGULAR, is_korean_codepoint, korean_extra_scale)]
+CJK_SOURCES_KR_BOLD = [("KR", LINE_SEED_KR_BOLD, is_korean_codepoint, korean_extra_scale)]
+
+# Variants to build: (output path, base Hack font, CJK sources)
+VARIANTS = [
+    (OUTPUT_REGULAR, HACK_REGULAR, CJK_SOURCES_JP_REGULAR),
+    (OUTPUT_BOLD, HACK_BOLD, CJK_SOURCES_JP_BOLD),
+    (OUTPUT_JK_REGULAR, HACK_REGULAR, CJK_SOURCES_JP_REGULAR + CJK_SOURCES_KR_REGULAR),
+    (OUTPUT_JK_BOLD, HACK_BOLD, CJK_SOURCES_JP_BOLD + CJK_SOURCES_KR_BOLD),
+]
+
+
 def draw_dashed_square(pen):
     """Draw a rounded dashed square using the provided pen.
     Coordinates based on HackGen's Ideographic_Space.sfd, scaled by 2.
@@ -215,15 +266,15 @@ def scale_glyph(glyph, scale, glyf_table):
             for comp in glyph.components:
                 # Scale the offset
                 if hasattr(comp, 'x'):
-                    comp.x = int(comp.x * scale)
+                    comp.x = otRound(comp.x * scale)
                 if hasattr(comp, 'y'):
-                    comp.y = int(comp.y * scale)
+                    comp.y = otRound(comp.y * scale)
         return glyph
     
     # Simple glyph
     if hasattr(glyph, 'coordinates') and glyph.coordinates:
-        # Scale coordinates
-        scaled_coords = [(int(x * scale), int(y * scale)) for x, y in glyph.coordinates]
+        # Scale coordinates (rounded to nearest, truncation would pull outlines towards the origin)
+        scaled_coords = [(otRound(x * scale), otRound(y * scale)) for x, y in glyph.coordinates]
         glyph.coordinates = GlyphCoordinates(scaled_coords)
     
     # Recalculate bounds after scaling
@@ -233,7 +284,94 @@ def scale_glyph(glyph, scale, glyf_table):
     return glyph
 
 
-def merge_cjk_fonts(hack_path, output_path, cjk_sources):
+def transform_cjk_glyphs(cjk_font, lang, scale, targets):
+    """Copy, scale and clean up CJK glyphs for the given (codepoint, glyph name) pairs.
+    Returns (codepoint, new glyph name, glyph data, hmtx entry, cleanup stats, error)
+    tuples in the same order as targets.
+    Simple glyphs are compiled to bytes so they can be sent between processes cheaply.
+    Composite glyphs are returned as Glyph objects, because their component
+    references can only be compiled against the merged glyf table.
+    """
+    cjk_glyf = cjk_font['glyf']
+    cjk_metrics = cjk_font['hmtx'].metrics
+    results = []
+
+    for codepoint, cjk_glyph_name in targets:
+        # Create new glyph name to avoid conflicts
+        new_glyph_name = f"uni{codepoint:04X}_{lang}"
+
+        try:
+            new_glyph = scale_glyph(copy.deepcopy(cjk_glyf[cjk_glyph_name]), scale, cjk_glyf)
+            x_min = getattr(new_glyph, 'xMin', 0)
+            stats = cleanup_glyph(new_glyph, cjk_glyf)
+            if new_glyph.isComposite():
+                glyph_data = new_glyph
+            else:
+                # Bounds were already recalculated by scale_glyph and cleanup_glyph
+                glyph_data = new_glyph.compile(cjk_glyf, recalcBBoxes=False)
+
+            metrics = None
+            if cjk_glyph_name in cjk_metrics:
+                width, lsb = cjk_metrics[cjk_glyph_name]
+                # Keep the LSB in sync if cleanup removed the leftmost contour
+                lsb_shift = getattr(new_glyph, 'xMin', x_min) - x_min
+                metrics = (otRound(width * scale), otRound(lsb * scale) + lsb_shift)
+
+            results.append((codepoint, new_glyph_name, glyph_data, metrics, stats, None))
+        except Exception as e:
+            results.append((codepoint, new_glyph_name, None, None, None, str(e)))
+
+    return results
+
+
+def _transform_cjk_shard(font_path, lang, scale, shard):
+    """Process pool entry point: transform one shard of CJK glyphs.
+    Forked workers inherit the parent's parsed source font from the cache;
+    with spawn/forkserver each worker parses it again on first use.
+    """
+    cjk_font = load_source_font(font_path)
+    return transform_cjk_glyphs(cjk_font, lang, scale, shard)
+
+
+def _pool_context():
+    """Multiprocessing context for the glyph workers.
+    On Linux fork is requested explicitly (Python 3.14 defaults to forkserver)
+    so workers share the parsed source fonts. Other platforms keep their
+    default (spawn on macOS, where forking is unsafe with system frameworks).
+    """
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def transform_cjk_glyphs_parallel(cjk_font, font_path, lang, scale, targets, jobs):
+    """Transform CJK glyphs in a process pool, split into contiguous shards.
+    Shard results are concatenated in submission order, so the result order
+    (and therefore the merged glyph order) is identical to a serial run.
+    """
+    if jobs <= 1 or len(targets) < 2:
+        return transform_cjk_glyphs(cjk_font, lang, scale, targets)
+
+    shard_count = min(len(targets), jobs * SHARDS_PER_JOB)
+    shard_size = -(-len(targets) // shard_count)  # ceil division
+    shards = [targets[i:i + shard_size] for i in range(0, len(targets), shard_size)]
+    print(f"  Transforming {len(targets)} {lang} glyphs in {len(shards)} shards ({jobs} jobs)")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=_pool_context()) as executor:
+        shard_results = executor.map(
+            _transform_cjk_shard,
+            [font_path] * len(shards),
+            [lang] * len(shards),
+            [scale] * len(shards),
+            shards,
+        )
+        for shard_result in shard_results:
+            results.extend(shard_result)
+    return results
+
+
+def merge_cjk_fonts(hack_path, output_path, cjk_sources, jobs=DEFAULT_JOBS):
     """Merge CJK glyphs from specified sources into Hack font."""
     print(f"Loading base font: {hack_path}...")
     hack = TTFont(hack_path)
@@ -259,28 +397,20 @@ def merge_cjk_fonts(hack_path, output_path, cjk_sources):
 
     total_glyphs_copied = 0
 
-    for lang, font_path, is_target_codepoint in cjk_sources:
+    for lang, font_path, is_target_codepoint, get_extra_scale in cjk_sources:
         if not font_path or not os.path.exists(font_path):
             print(f"Skipping {lang} font: not found at {font_path}")
             continue
 
         print(f"Loading {lang} font: {font_path}...")
-        cjk_font = TTFont(font_path)
+        # Source fonts are shared through the cache and only read here
+        cjk_font = load_source_font(font_path)
         cjk_upm = cjk_font['head'].unitsPerEm
         scale = hack_upm / cjk_upm
-        # For Korean fonts, the original glyph width (883) is smaller than Japanese (1000).
-        # Apply additional scaling to match the 5:3 half-width to full-width ratio.
-        if lang == "KR":
-            # Get typical Korean glyph width (가 = U+AC00)
-            kr_cmap = cjk_font.getBestCmap()
-            if 0xAC00 in kr_cmap:
-                kr_glyph_name = kr_cmap[0xAC00]
-                kr_width, _ = cjk_font['hmtx'].metrics[kr_glyph_name]
-                # Scale to make full-width = 2048 (same as JP)
-                # Target width should be 2048, so extra_scale = 1000 / kr_width
-                extra_scale = 1000 / kr_width
-                scale = scale * extra_scale
-                print(f"  Adjusted scale for {lang}: {scale:.4f} (extra: {extra_scale:.4f})")
+        extra_scale = get_extra_scale(cjk_font) if get_extra_scale else None
+        if extra_scale is not None:
+            scale = scale * extra_scale
+            print(f"  Adjusted scale for {lang}: {scale:.4f} (extra: {extra_scale:.4f})")
         else:
             print(f"  Scale for {lang}: {scale:.4f}")
 
@@ -288,34 +418,41 @@ def merge_cjk_fonts(hack_path, output_path, cjk_sources):
         cjk_glyf = cjk_font['glyf']
         glyphs_copied = 0
 
-        for codepoint, cjk_glyph_name in cjk_cmap.items():
-            if not is_target_codepoint(codepoint) or codepoint in hack_cmap or codepoint == 0x3000:
-                continue
-
-            if cjk_glyph_name not in cjk_glyf:
+        targets = [
+            (codepoint, cjk_glyph_name)
+            for codepoint, cjk_glyph_name in cjk_cmap.items()
+            if is_target_codepoint(codepoint)
+            and codepoint not in hack_cmap
+            and codepoint != 0x3000
+            and cjk_glyph_name in cjk_glyf
+        ]
+
+        results = transform_cjk_glyphs_parallel(cjk_font, font_path, lang, scale, targets, jobs)
+        cleanup_totals = {}
+
+        # Merge in target order so the glyph order is deterministic
+        for codepoint, new_glyph_name, glyph_data, metrics, stats, error in results:
+            if error is not None:
+                print(f"Warning: Failed to copy {lang} glyph U+{codepoint:04X}: {error}")
                 continue
 
-            # Create new glyph name to avoid conflicts
-            new_glyph_name = f"uni{codepoint:04X}_{lang}"
+            if isinstance(glyph_data, bytes):
+                glyph_data = Glyph(glyph_data)
+            hack_glyf[new_glyph_name] = glyph_data
+            hack_glyph_order.append(new_glyph_name)
+            hack_cmap[codepoint] = new_glyph_name
 
-            # Copy and scale glyph
-            try:
-                new_glyph = scale_glyph(copy.deepcopy(cjk_glyf[cjk_glyph_name]), scale, hack_glyf)
-                hack_glyf[new_glyph_name] = new_glyph
-                hack_glyph_order.append(new_glyph_name)
-                hack_cmap[codepoint] = new_glyph_name
+            if metrics is not None:
+                hack['hmtx'].metrics[new_glyph_name] = metrics
 
-                if cjk_glyph_name in cjk_font['hmtx'].metrics:
-                    width, lsb = cjk_font['hmtx'].metrics[cjk_glyph_name]
-                    hack['hmtx'].metrics[new_glyph_name] = (int(width * scale), int(lsb * scale))
+            add_cleanup_stats(cleanup_totals, cjk_block_name(codepoint), stats)
+            glyphs_copied += 1
 
-                glyphs_copied += 1
-            except Exception as e:
-                print(f"Warning: Failed to copy {lang} glyph U+{codepoint:04X}: {e}")
-        
         print(f"Copied {glyphs_copied} {lang} glyphs")
+        print_cleanup_report(lang, cleanup_totals)
         total_glyphs_copied += glyphs_copied
-        cjk_font.close()
+        # Transformed glyphs are independent copies, the source is no longer needed
+        release_source_font(font_path)
 
     print(f"\nTotal CJK glyphs copied: {total_glyphs_copied}")
     
@@ -348,6 +485,11 @@ def main():
     print("HackLine Font Generator v3")
     print("=" * 60)
 
+    parser = argparse.ArgumentParser(description="Merge Hack and LINE Seed fonts into HackLine.")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help="Number of worker processes for glyph transformation (1 = serial).")
+    args = parser.parse_args()
+
     # Check for base Hack fonts
     if not os.path.exists(HACK_REGULAR) or not os.path.exists(HACK_BOLD):
         print("Error: Hack Regular and Bold TTF files must be present.")
@@ -355,27 +497,9 @@ def main():
 
     os.makedirs("build", exist_ok=True)
 
-    # --- Generate HackLine (JP only) ---
-    print("\n--- Generating HackLine (Japanese) ---")
-    cjk_sources_jp_reg = [("JP", LINE_SEED_JP_REGULAR, is_japanese_codepoint)]
-    merge_cjk_fonts(HACK_REGULAR, OUTPUT_REGULAR, cjk_sources_jp_reg)
-
-    cjk_sources_jp_bold = [("JP", LINE_SEED_JP_BOLD, is_japanese_codepoint)]
-    merge_cjk_fonts(HACK_BOLD, OUTPUT_BOLD, cjk_sources_jp_bold)
-
-    # --- Generate HackLineJK (JP and KR) ---
-    print("\n--- Generating HackLineJK (Japanese + Korean) ---")
-    cjk_sources_jk_reg = [
-        ("JP", LINE_SEED_JP_REGULAR, is_japanese_codepoint),
-        ("KR", LINE_SEED_KR_REGULAR, is_korean_codepoint),
-    ]
-    merge_cjk_fonts(HACK_REGULAR, OUTPUT_JK_REGULAR, cjk_sources_jk_reg)
-
-    cjk_sources_jk_bold = [
-        ("JP", LINE_SEED_JP_BOLD, is_japanese_codepoint),
-        ("KR", LINE_SEED_KR_BOLD, is_korean_codepoint),
-    ]
-    merge_cjk_fonts(HACK_BOLD, OUTPUT_JK_BOLD, cjk_sources_jk_bold)
+    for output_path, hack_path, cjk_sources in VARIANTS:
+        print(f"\n--- Generating {os.path.basename(output_path)} ---")
+        merge_cjk_fonts(hack_path, output_path, cjk_sources, args.jobs)
 
     print("\n" + "=" * 60)
     print("All fonts generated successfully!")
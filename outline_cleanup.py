@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+HackLine Outline Cleanup
+Removes points that became redundant after scaling glyphs to the Hack UPM:
+duplicate points, collinear on-curve points, degenerate control points,
+implied on-curve points and zero-area contours.
+The outline shape is not changed, only its point count (and glyf size).
+"""
+
+import array
+from fontTools.ttLib.tables import ttProgram
+from fontTools.ttLib.tables._g_l_y_f import (
+    GlyphCoordinates,
+    dropImpliedOnCurvePoints,
+    flagCubic,
+    flagOnCurve,
+    flagOverlapSimple,
+)
+
+
+def _cross(o, a, b):
+    """Z component of the cross product of (a - o) and (b - o)."""
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _is_between(a, p, b):
+    """Check if p (collinear with a and b) lies on the segment from a to b."""
+    return min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
+
+
+def _is_redundant(prev, point, nxt):
+    """Check if point can be removed without changing the contour.
+    Points are (x, y, flag) tuples.
+    """
+    prev_on = prev[2] & flagOnCurve
+    point_on = point[2] & flagOnCurve
+    next_on = nxt[2] & flagOnCurve
+
+    if point_on:
+        # Duplicate of the previous on-curve point (zero-length segment)
+        if prev_on and point[:2] == prev[:2]:
+            return True
+        # On a straight line between its neighbours
+        if prev_on and next_on and _cross(prev, point, nxt) == 0 and _is_between(prev, point, nxt):
+            return True
+        return False
+
+    # Off-curve point on top of an on-curve neighbour: with on-curve points on
+    # both sides, the quadratic segment is a straight line.
+    if prev_on and next_on and (point[:2] == prev[:2] or point[:2] == nxt[:2]):
+        return True
+    return False
+
+
+def _clean_contour(points):
+    """Remove redundant points from a contour until nothing changes."""
+    changed = True
+    while changed and len(points) > 2:
+        changed = False
+        kept = []
+        count = len(points)
+        for i, point in enumerate(points):
+            prev = kept[-1] if kept else points[-1]
+            nxt = points[i + 1] if i + 1 < count else (kept[0] if kept else points[0])
+            if _is_redundant(prev, point, nxt):
+                changed = True
+            else:
+                kept.append(point)
+        points = kept
+    return points
+
+
+def _is_degenerate(points):
+    """Check if a contour encloses no area (too few points or all collinear)."""
+    if len(points) < 3:
+        return True
+    origin = points[0]
+    direction = next((p for p in points if p[:2] != origin[:2]), None)
+    if direction is None:
+        return True
+    return all(_cross(origin, direction, p) == 0 for p in points)
+
+
+def cleanup_glyph(glyph, glyf_table):
+    """Remove redundant points and degenerate contours from a simple glyph in place.
+    Hinting instructions address points by index, so they are dropped when points are removed.
+    Returns (points before, points after, glyf bytes before, glyf bytes after, contours removed).
+    """
+    if glyph.numberOfContours <= 0 or not hasattr(glyph, 'coordinates'):
+        # Composite and empty glyphs have no points to clean up
+        return (0, 0, 0, 0, 0)
+
+    coords = glyph.coordinates
+    flags = glyph.flags
+    points_before = len(coords)
+    bytes_before = len(glyph.compile(glyf_table, recalcBBoxes=False))
+    if any(flag & flagCubic for flag in flags):
+        # Rules below assume quadratic outlines
+        return (points_before, points_before, bytes_before, bytes_before, 0)
+
+    overlap = flags[0] & flagOverlapSimple if points_before else 0
+    contours = []
+    start = 0
+    for end in glyph.endPtsOfContours:
+        contours.append([
+            (coords[i][0], coords[i][1], flags[i] & ~flagOverlapSimple) for i in range(start, end + 1)
+        ])
+        start = end + 1
+
+    cleaned = [c for c in (_clean_contour(contour) for contour in contours) if not _is_degenerate(c)]
+    contours_removed = len(contours) - len(cleaned)
+
+    if not cleaned:
+        # Nothing visible left: turn it into an empty glyph
+        glyph.__dict__.clear()
+        glyph.numberOfContours = 0
+        return (points_before, 0, bytes_before, 0, contours_removed)
+
+    points = [point for contour in cleaned for point in contour]
+    if len(points) != points_before:
+        end_pts = []
+        for contour in cleaned:
+            end_pts.append((end_pts[-1] if end_pts else -1) + len(contour))
+        new_flags = array.array("B", (point[2] for point in points))
+        new_flags[0] |= overlap
+        glyph.coordinates = GlyphCoordinates([point[:2] for point in points])
+        glyph.flags = new_flags
+        glyph.endPtsOfContours = end_pts
+        glyph.numberOfContours = len(cleaned)
+
+    dropImpliedOnCurvePoints(glyph)
+
+    points_after = len(glyph.coordinates)
+    if points_after != points_before:
+        glyph.program = ttProgram.Program()
+        glyph.program.fromBytecode(b"")
+        glyph.recalcBounds(glyf_table)
+
+    bytes_after = len(glyph.compile(glyf_table, recalcBBoxes=False))
+    return (points_before, points_after, bytes_before, bytes_after, contours_removed)
+
+
+def add_cleanup_stats(totals, block, stats):
+    """Accumulate (points before, points after, bytes before, bytes after, contours removed) per block."""
+    block_totals = totals.setdefault(block, [0, 0, 0, 0, 0, 0])
+    block_totals[0] += 1
+    for i, value in enumerate(stats, start=1):
+        block_totals[i] += value
+
+
+def _reduction(before, after):
+    """Format a before -> after reduction."""
+    percent = (before - after) / before * 100 if before else 0.0
+    return f"{before} -> {after} (-{percent:.1f}%)"
+
+
+def print_cleanup_report(label, totals):
+    """Print point-count and glyf-byte reductions per block."""
+    if not totals:
+        return
+    print(f"  Outline cleanup ({label}):")
+    grand_total = [0] * 6
+    for block, (glyphs, pts_before, pts_after, bytes_before, bytes_after, removed) in totals.items():
+        print(f"    {block}: {glyphs} glyphs, points {_reduction(pts_before, pts_after)}, "
+              f"glyf bytes {_reduction(bytes_before, bytes_after)}, {removed} contours removed")
+        grand_total = [a + b for a, b in zip(grand_total, totals[block])]
+    glyphs, pts_before, pts_after, bytes_before, bytes_after, removed = grand_total
+    print(f"    Total: {glyphs} glyphs, points {_reduction(pts_before, pts_after)}, "
+          f"glyf bytes {_reduction(bytes_before, bytes_after)}, {removed} contours removed")
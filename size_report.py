@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+HackLine Size Report
+Breaks every built font down by table and by glyph source (Hack, JP, KR, each Nerd Font set),
+shows headroom against the glyph count and maxp limits, compares against a stored baseline
+and fails when the size budget is exceeded.
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import struct
+import fnmatch
+import argparse
+from fontTools.ttLib import TTFont
+from add_nerd_glyphs import nerd_set_name
+
+# --- Default Configuration ---
+DEFAULT_FONT_GLOB = "build/*.ttf"
+DEFAULT_OUTPUT_PATH = "build/size_report.json"
+DEFAULT_BASELINE_PATH = "size_baseline.json"
+DEFAULT_BUDGET_PATH = "size_budget.json"
+
+MAX_GLYPHS = 65535  # glyph IDs are 16-bit
+MAXP_LIMIT = 65535  # maxp fields are uint16
+MAXP_FIELDS = [
+    "maxPoints",
+    "maxContours",
+    "maxCompositePoints",
+    "maxCompositeContours",
+    "maxComponentElements",
+    "maxComponentDepth",
+]
+
+# Glyph names given by merge_fonts.py and add_nerd_glyphs.py
+CJK_GLYPH_NAME = re.compile(r"^uni[0-9A-F]{4,6}_(JP|KR)$")
+NERD_GLYPH_NAME = re.compile(r"^nf_([0-9A-F]{4,6})$")
+
+
+def glyph_source(glyph_name):
+    """Source block of a glyph, derived from its name."""
+    match = CJK_GLYPH_NAME.match(glyph_name)
+    if match:
+        return match.group(1)
+    match = NERD_GLYPH_NAME.match(glyph_name)
+    if match:
+        return f"Nerd: {nerd_set_name(int(match.group(1), 16))}"
+    return "Hack"
+
+
+def glyph_size_and_points(glyph):
+    """Compiled size and point count of a glyph, read from its raw glyf data."""
+    # Glyphs are not expanded after loading; empty glyphs have no data
+    data = getattr(glyph, 'data', b"")
+    if len(data) < 10:
+        return len(data), 0
+    number_of_contours = struct.unpack(">h", data[:2])[0]
+    if number_of_contours <= 0:
+        # Composite glyphs have no points of their own
+        return len(data), 0
+    last_end_pt = struct.unpack(">H", data[10 + 2 * (number_of_contours - 1):10 + 2 * number_of_contours])[0]
+    return len(data), last_end_pt + 1
+
+
+def analyze_font(font_path):
+    """Size breakdown of one font. Returns a JSON-serializable dict."""
+    font = TTFont(font_path)
+    tables = {tag: font.reader.tables[tag].length for tag in sorted(font.reader.keys())}
+
+    sources = {}
+    if 'glyf' in font:
+        glyf = font['glyf']
+        for glyph_name in font.getGlyphOrder():
+            size, points = glyph_size_and_points(glyf.glyphs[glyph_name])
+            source = sources.setdefault(glyph_source(glyph_name), {"glyphs": 0, "glyf_bytes": 0, "points": 0})
+            source["glyphs"] += 1
+            source["glyf_bytes"] += size
+            source["points"] += points
+
+    maxp = font['maxp']
+    num_glyphs = maxp.numGlyphs
+    limits = {"numGlyphs": {"value": num_glyphs, "limit": MAX_GLYPHS, "headroom": MAX_GLYPHS - num_glyphs}}
+    for field in MAXP_FIELDS:
+        if hasattr(maxp, field):
+            value = getattr(maxp, field)
+            limits[field] = {"value": value, "limit": MAXP_LIMIT, "headroom": MAXP_LIMIT - value}
+    font.close()
+
+    return {
+        "file_size": os.path.getsize(font_path),
+        "tables": tables,
+        "sources": sources,
+        "limits": limits,
+    }
+
+
+def _delta(current, previous):
+    """Format a change against the baseline."""
+    if previous is None:
+        return "(new)"
+    diff = current - previous
+    percent = diff / previous * 100 if previous else 0.0
+    return f"({diff:+d}, {percent:+.2f}%)" if diff else ""
+
+
+def print_report(name, report, baseline):
+    """Print the breakdown of one font, with changes against its baseline if given."""
+    def delta(current, previous):
+        return _delta(current, previous) if baseline else ""
+
+    base = baseline or {}
+    print(f"\n--- {name} ---")
+    print(f"File size: {report['file_size']:,} bytes {delta(report['file_size'], base.get('file_size'))}")
+
+    print("Tables:")
+    base_tables = base.get("tables", {})
+    for tag, length in sorted(report["tables"].items(), key=lambda item: -item[1]):
+        print(f"  {tag:<4}  {length:>12,} bytes  {delta(length, base_tables.get(tag))}")
+
+    print("Glyph sources:")
+    base_sources = base.get("sources", {})
+    for source, stats in report["sources"].items():
+        base_glyf_bytes = base_sources.get(source, {}).get("glyf_bytes")
+        print(f"  {source:<32} {stats['glyphs']:>6} glyphs  {stats['points']:>9,} points  "
+              f"{stats['glyf_bytes']:>12,} bytes  {delta(stats['glyf_bytes'], base_glyf_bytes)}")
+
+    print("Limits:")
+    for field, limit in report["limits"].items():
+        print(f"  {field:<22} {limit['value']:>6} / {limit['limit']}  (headroom {limit['headroom']})")
+
+
+def budget_for(budget, name):
+    """Absolute file size budget for a font, from the first matching pattern."""
+    for pattern, max_bytes in budget.get("max_file_bytes", {}).items():
+        if fnmatch.fnmatch(name, pattern):
+            return max_bytes
+    return None
+
+
+def check_budget(name, report, baseline, budget):
+    """Return the list of budget violations for one font."""
+    errors = []
+
+    # The hard limits are checked through the headroom below; max_glyphs is an optional tighter budget
+    max_glyphs = budget.get("max_glyphs")
+    num_glyphs = report["limits"]["numGlyphs"]["value"]
+    if max_glyphs is not None and num_glyphs > max_glyphs:
+        errors.append(f"{name}: {num_glyphs} glyphs exceeds the budget of {max_glyphs}")
+
+    for field, limit in report["limits"].items():
+        if limit["headroom"] < 0:
+            errors.append(f"{name}: {field} {limit['value']} exceeds the limit of {limit['limit']}")
+
+    max_bytes = budget_for(budget, name)
+    if max_bytes is not None and report["file_size"] > max_bytes:
+        errors.append(f"{name}: {report['file_size']:,} bytes exceeds the budget of {max_bytes:,} bytes")
+
+    max_growth = budget.get("max_growth_percent")
+    if baseline and max_growth is not None:
+        previous = baseline["file_size"]
+        growth = (report["file_size"] - previous) / previous * 100
+        if growth > max_growth:
+            errors.append(f"{name}: grew {growth:.2f}% over the baseline ({previous:,} -> "
+                          f"{report['file_size']:,} bytes), the budget is {max_growth}%")
+
+    return errors
+
+
+def load_json(path, description):
+    """Load an optional JSON file, or return None if it does not exist."""
+    if not path or not os.path.exists(path):
+        print(f"No {description} found at '{path}'")
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path, data):
+    """Save data as JSON, creating the parent directory."""
+    output_dir = os.path.dirname(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def main():
+    """Reports the size of every built font and checks it against the budget."""
+    parser = argparse.ArgumentParser(description="Report font sizes by table and glyph source, and enforce the size budget.")
+    parser.add_argument("fonts", nargs="*", help=f"Font files to analyze (default: {DEFAULT_FONT_GLOB}).")
+    parser.add_argument("--output-path", default=DEFAULT_OUTPUT_PATH, help="Path to save the JSON report.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline report to compare against.")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET_PATH, help="Size budget configuration.")
+    parser.add_argument("--update-baseline", action="store_true", help="Save this report as the new baseline.")
+    parser.add_argument("--no-baseline", action="store_true",
+                        help="Only report and check the absolute budget, without comparing against a baseline.")
+    args = parser.parse_args()
+
+    font_paths = args.fonts or sorted(glob.glob(DEFAULT_FONT_GLOB))
+    if not font_paths:
+        print(f"Error: No fonts found matching '{DEFAULT_FONT_GLOB}'")
+        print("Please build the fonts first.")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("HackLine Size Report")
+    print("=" * 60)
+
+    baseline = None
+    if not args.update_baseline and not args.no_baseline:
+        baseline = load_json(args.baseline, "baseline")
+        if baseline is None:
+            # Without a baseline the growth budget cannot be checked
+            print("Error: A baseline is required (use --update-baseline to create one, or --no-baseline to skip it)")
+            sys.exit(1)
+    budget = load_json(args.budget, "size budget") or {}
+
+    report = {"fonts": {}}
+    errors = []
+    for font_path in font_paths:
+        name = os.path.basename(font_path)
+        font_report = analyze_font(font_path)
+        font_baseline = baseline["fonts"].get(name) if baseline else None
+        report["fonts"][name] = font_report
+        print_report(name, font_report, font_baseline)
+        errors += check_budget(name, font_report, font_baseline, budget)
+        if baseline and font_baseline is None:
+            errors.append(f"{name}: not in the baseline, so its growth cannot be checked")
+
+    save_json(args.output_path, report)
+    print(f"\n✓ Size report saved to '{args.output_path}'")
+    if args.update_baseline:
+        save_json(args.baseline, report)
+        print(f"✓ Baseline updated at '{args.baseline}'")
+
+    if errors:
+        print("\n" + "=" * 60)
+        print("Size budget exceeded:")
+        for error in errors:
+            print(f"  ✗ {error}")
+        print("=" * 60)
+        sys.exit(1)
+
+    print("✓ Size budget OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -54,32 +54,26 @@ BACKGROUND_COLOR = (255, 255, 255)  # White
 TEXT_COLOR = (0, 0, 0)  # Black
 PADDING = 20
 
-# --- Main Script ---
-def main():
-    """Generates the test image."""
-    parser = argparse.ArgumentParser(description="Generate a visual test image for a font.")
-    parser.add_argument("--font-path", default=DEFAULT_FONT_PATH, help="Path to the TTF font file.")
-    parser.add_argument("--output-path", default=DEFAULT_OUTPUT_PATH, help="Path to save the output PNG image.")
-    args = parser.parse_args()
-
-    print("--- Starting Visual Test Script ---")
-
+def render_test_image(font_path, output_path):
+    """Render the test text with the given font and save it as a PNG.
+    Returns True on success.
+    """
     # Check if font file exists
-    if not os.path.exists(args.font_path):
-        print(f"Error: Font file not found at '{args.font_path}'")
+    if not os.path.exists(font_path):
+        print(f"Error: Font file not found at '{font_path}'")
         print("Please ensure the font has been built and the path is correct.")
-        return
+        return False
 
     # Load font
     try:
-        font = ImageFont.truetype(args.font_path, FONT_SIZE)
+        font = ImageFont.truetype(font_path, FONT_SIZE)
     except IOError:
-        print(f"Error: Could not load font from '{args.font_path}'")
-        return
+        print(f"Error: Could not load font from '{font_path}'")
+        return False
 
     # Determine which text to use based on font type
     base_text_parts = [TEXT_JAPANESE]
-    font_name = os.path.basename(args.font_path)
+    font_name = os.path.basename(font_path)
 
     # Add Korean text only for JK variants
     if "JK" in font_name:
@@ -123,13 +117,26 @@ def main():
     )
 
     # Ensure output directory exists and save the image
-    output_dir = os.path.dirname(args.output_path)
+    output_dir = os.path.dirname(output_path)
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
-    img.save(args.output_path)
+    img.save(output_path)
+
+    print(f"✓ Test image saved successfully to '{output_path}'")
+    return True
 
-    print(f"✓ Test image saved successfully to '{args.output_path}'")
-    print("--- Visual Test Script Finished ---")
+
+# --- Main Script ---
+def main():
+    """Generates the test image."""
+    parser = argparse.ArgumentParser(description="Generate a visual test image for a font.")
+    parser.add_argument("--font-path", default=DEFAULT_FONT_PATH, help="Path to the TTF font file.")
+    parser.add_argument("--output-path", default=DEFAULT_OUTPUT_PATH, help="Path to save the output PNG image.")
+    args = parser.parse_args()
+
+    print("--- Starting Visual Test Script ---")
+    if render_test_image(args.font_path, args.output_path):
+        print("--- Visual Test Script Finished ---")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+HackLine Watch Mode
+Keeps the parsed source fonts in memory and rebuilds only the affected
+variants when the build scripts or source fonts change.
+Optionally re-renders visual_test.py specimens after every rebuild.
+"""
+
+import os
+import sys
+import ast
+import time
+import argparse
+import importlib
+import traceback
+import font_cache
+import merge_fonts
+import add_nerd_glyphs
+import outline_cleanup
+import visual_test
+
+POLL_INTERVAL = 0.5  # seconds between checks for changes
+SETTLE_DELAY = 0.2  # wait for editors to finish writing before rebuilding
+SPECIMEN_DIR = "build/specimens"
+
+# Watched scripts and their modules (font_cache.py is never reloaded, so the cache survives).
+# outline_cleanup.py comes first so it is reloaded before the scripts that import from it.
+SCRIPTS = {
+    "outline_cleanup.py": "outline_cleanup",
+    "merge_fonts.py": "merge_fonts",
+    "add_nerd_glyphs.py": "add_nerd_glyphs",
+    "visual_test.py": "visual_test",
+}
+
+
+def top_level_definitions(path):
+    """Map each top-level name in a script to a dump of the statements defining it.
+    Comments and formatting are not part of the dump, so cosmetic edits do not
+    trigger rebuilds.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    definitions = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names = [node.name]
+        elif isinstance(node, ast.Assign):
+            names = [target.id for target in node.targets if isinstance(target, ast.Name)]
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            names = [node.target.id]
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names = [(alias.asname or alias.name).split(".")[0] for alias in node.names]
+        else:
+            names = []
+        # Statements without a name (e.g. the __main__ guard) are grouped together
+        for name in names or ["<module>"]:
+            definitions[name] = definitions.get(name, "") + ast.dump(node)
+    return definitions
+
+
+def changed_names(old_definitions, new_definitions):
+    """Names whose definition was added, removed or modified."""
+    names = set(old_definitions) | set(new_definitions)
+    return {name for name in names if old_definitions.get(name) != new_definitions.get(name)}
+
+
+def _flatten(value):
+    """Yield the leaves of nested tuples and lists."""
+    if isinstance(value, (tuple, list)):
+        for item in value:
+            yield from _flatten(item)
+    else:
+        yield value
+
+
+def _code_names(code):
+    """Global names used by a code object, including nested functions."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if hasattr(const, "co_names"):
+            names |= _code_names(const)
+    return names
+
+
+def _assignment_names(path):
+    """Names used by each top-level assignment in a script (KOREAN_RANGES -> KOREAN_BLOCKS)."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    names = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            used = {n.id for n in ast.walk(node.value) if isinstance(n, ast.Name)}
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    names[target.id] = used
+    return names
+
+
+def variant_dependencies(module, variant):
+    """Top-level names of module that a variant refers to, followed transitively
+    through the functions and assignments it uses
+    (e.g. is_korean_codepoint -> KOREAN_RANGES -> KOREAN_BLOCKS).
+    """
+    module_names = {name: value for name, value in vars(module).items() if not name.startswith("__")}
+    assignment_names = _assignment_names(module.__file__)
+    leaves = list(_flatten(variant))
+
+    pending = [
+        name for name, value in module_names.items()
+        if any(value is leaf or (isinstance(leaf, str) and value == leaf) for leaf in leaves)
+    ]
+    dependencies = set()
+    while pending:
+        name = pending.pop()
+        if name in dependencies:
+            continue
+        dependencies.add(name)
+        code = getattr(module_names[name], "__code__", None)
+        used = _code_names(code) if code is not None else assignment_names.get(name, set())
+        pending.extend(n for n in used if n in module_names)
+    return dependencies
+
+
+def affected_variants(module, names):
+    """Indexes into module.VARIANTS that must be rebuilt after names changed.
+    A name that no single variant depends on (shared merge code, imports, ...)
+    affects every variant.
+    """
+    all_variants = set(range(len(module.VARIANTS)))
+    affected = set()
+    for name in names:
+        users = {i for i, variant in enumerate(module.VARIANTS) if name in variant_dependencies(module, variant)}
+        affected |= users or all_variants
+    return affected
+
+
+def source_paths():
+    """Source font paths referenced by the merge and Nerd Font variants."""
+    paths = set()
+    for _, hack_path, cjk_sources in merge_fonts.VARIANTS:
+        paths.add(hack_path)
+        paths.update(font_path for _, font_path, _, _ in cjk_sources)
+    paths.update(nerd_path for _, nerd_path, _ in add_nerd_glyphs.VARIANTS)
+    return paths
+
+
+def snapshot_mtimes(paths):
+    """Modification time of each existing path."""
+    return {path: os.path.getmtime(path) for path in paths if os.path.exists(path)}
+
+
+def warm_source_cache():
+    """Parse every read-only source font once and keep it in memory."""
+    for path in sorted(source_paths()):
+        if path in (merge_fonts.HACK_REGULAR, merge_fonts.HACK_BOLD) or not os.path.exists(path):
+            # The Hack base font is modified during the merge, so it is always reloaded
+            continue
+        print(f"Loading {path}...")
+        font = font_cache.load_source_font(path)
+        font.getBestCmap()
+        font['glyf']
+        font['hmtx']
+
+
+def build_merge_variants(indexes, jobs):
+    """Run merge_cjk_fonts for the given merge variants. Returns the built outputs."""
+    built = []
+    os.makedirs("build", exist_ok=True)
+    for i, (output_path, hack_path, cjk_sources) in enumerate(merge_fonts.VARIANTS):
+        if i not in indexes:
+            continue
+        print(f"\n--- Generating {os.path.basename(output_path)} ---")
+        try:
+            merge_fonts.merge_cjk_fonts(hack_path, output_path, cjk_sources, jobs)
+            built.append(output_path)
+        except Exception:
+            traceback.print_exc()
+    return built
+
+
+def build_nerd_variants(indexes):
+    """Run patch_with_nerd_glyphs for the given Nerd Font variants. Returns the built outputs."""
+    built = []
+    for i, (base_path, nerd_path, output_path) in enumerate(add_nerd_glyphs.VARIANTS):
+        if i not in indexes:
+            continue
+        if not os.path.exists(base_path) or not os.path.exists(nerd_path):
+            print(f"Warning: {base_path} or {nerd_path} not found, skipping")
+            continue
+        print(f"\n--- Patching {base_path} ---")
+        try:
+            add_nerd_glyphs.patch_with_nerd_glyphs(base_path, nerd_path, output_path)
+            built.append(output_path)
+        except Exception:
+            traceback.print_exc()
+    return built
+
+
+def render_specimens(font_paths):
+    """Render a visual_test.py specimen for each font into SPECIMEN_DIR."""
+    for font_path in font_paths:
+        name = os.path.splitext(os.path.basename(font_path))[0]
+        try:
+            visual_test.render_test_image(font_path, os.path.join(SPECIMEN_DIR, f"{name}.png"))
+        except Exception:
+            traceback.print_exc()
+
+
+def reload_script(path, definitions):
+    """Reload a changed script. Returns the names that changed,
+    or None if the script could not be loaded (the previous version stays active).
+    """
+    module_name = SCRIPTS[path]
+    try:
+        new_definitions = top_level_definitions(path)
+        importlib.reload(sys.modules[module_name])
+    except Exception:
+        traceback.print_exc()
+        print(f"Error: Could not reload {path}, keeping the previous version")
+        return None
+
+    names = changed_names(definitions[path], new_definitions)
+    definitions[path] = new_definitions
+    return names
+
+
+def rebuild(changed_scripts, changed_sources, definitions, args):
+    """Rebuild what is affected by the changed scripts and source fonts."""
+    merge_indexes = set()
+    nerd_indexes = set()
+    render_all = False
+
+    for path in changed_scripts:
+        names = reload_script(path, definitions)
+        if not names:
+            continue
+        print(f"{path}: changed {', '.join(sorted(names))}")
+        if path == "merge_fonts.py":
+            merge_indexes |= affected_variants(merge_fonts, names)
+        elif path == "add_nerd_glyphs.py":
+            nerd_indexes |= affected_variants(add_nerd_glyphs, names)
+        elif path == "visual_test.py":
+            render_all = True
+        elif path == "outline_cleanup.py":
+            # Both scripts import its functions by name, so they must be reloaded
+            # to pick up the new versions; every variant runs the cleanup
+            for dependent in ("merge_fonts.py", "add_nerd_glyphs.py"):
+                if dependent not in changed_scripts:
+                    reload_script(dependent, definitions)
+            merge_indexes |= set(range(len(merge_fonts.VARIANTS)))
+            nerd_indexes |= set(range(len(add_nerd_glyphs.VARIANTS)))
+
+    for path in changed_sources:
+        print(f"{path}: source font changed")
+        merge_indexes |= {
+            i for i, variant in enumerate(merge_fonts.VARIANTS) if path in _flatten(variant)
+        }
+        nerd_indexes |= {
+            i for i, variant in enumerate(add_nerd_glyphs.VARIANTS) if path == variant[1]
+        }
+
+    start = time.perf_counter()
+    built = build_merge_variants(merge_indexes, args.jobs)
+
+    if args.nerd:
+        # Nerd Font variants are patched on top of the rebuilt merge outputs
+        nerd_indexes |= {
+            i for i, (base_path, _, _) in enumerate(add_nerd_glyphs.VARIANTS) if base_path in built
+        }
+        built += build_nerd_variants(nerd_indexes)
+
+    if args.render:
+        if render_all:
+            outputs = [output for output, _, _ in merge_fonts.VARIANTS]
+            if args.nerd:
+                outputs += [output for _, _, output in add_nerd_glyphs.VARIANTS]
+            render_specimens([output for output in outputs if os.path.exists(output)])
+        else:
+            render_specimens(built)
+
+    if built:
+        print(f"\n✓ Rebuilt {len(built)} fonts in {time.perf_counter() - start:.1f}s")
+    elif render_all:
+        print(f"\n✓ Re-rendered specimens in {time.perf_counter() - start:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch the build scripts and source fonts and rebuild on change.")
+    parser.add_argument("-n", "--nerd", action="store_true", help="Also rebuild the Nerd Font variants.")
+    parser.add_argument("-r", "--render", action="store_true",
+                        help=f"Re-render visual_test.py specimens into {SPECIMEN_DIR}.")
+    parser.add_argument("-j", "--jobs", type=int, default=merge_fonts.DEFAULT_JOBS,
+                        help="Number of worker processes for glyph transformation (1 = serial).")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="Polling interval in seconds.")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("HackLine Watch Mode")
+    print("=" * 60)
+
+    font_cache.keep_source_fonts()
+    warm_source_cache()
+
+    definitions = {path: top_level_definitions(path) for path in SCRIPTS}
+    script_mtimes = snapshot_mtimes(SCRIPTS)
+    source_mtimes = snapshot_mtimes(source_paths())
+
+    # Build outputs that do not exist yet, so every variant can be rendered
+    missing = {i for i, (output, _, _) in enumerate(merge_fonts.VARIANTS) if not os.path.exists(output)}
+    built = build_merge_variants(missing, args.jobs) if missing else []
+    if args.nerd:
+        nerd_missing = {
+            i for i, (base, _, output) in enumerate(add_nerd_glyphs.VARIANTS)
+            if base in built or not os.path.exists(output)
+        }
+        if nerd_missing:
+            build_nerd_variants(nerd_missing)
+
+    print(f"\nWatching {', '.join(SCRIPTS)} and source fonts (Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(args.interval)
+            if snapshot_mtimes(SCRIPTS) == script_mtimes and snapshot_mtimes(source_paths()) == source_mtimes:
+                continue
+
+            time.sleep(SETTLE_DELAY)
+            new_script_mtimes = snapshot_mtimes(SCRIPTS)
+            new_source_mtimes = snapshot_mtimes(source_paths())
+            changed_scripts = [p for p in SCRIPTS if new_script_mtimes.get(p) != script_mtimes.get(p)]
+            changed_sources = [p for p in new_source_mtimes if new_source_mtimes[p] != source_mtimes.get(p)]
+            script_mtimes = new_script_mtimes
+
+            print("\n" + "=" * 60)
+            rebuild(changed_scripts, changed_sources, definitions, args)
+            # Source paths may have changed with the reloaded scripts
+            source_mtimes = snapshot_mtimes(source_paths())
+            print("\nWatching for changes...")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+if __name__ == "__main__":
+    main()